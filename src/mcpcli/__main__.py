@@ -1,22 +1,34 @@
 # src/__main__.py
 import argparse
 import asyncio
+import functools
 import json
 import logging
 import os
 import signal
+import subprocess
 import sys
-from typing import List
+from typing import List, Optional
 
 import anyio
 
 # Rich imports
 from rich import print
+from rich.console import Console
 from rich.markdown import Markdown
 from rich.panel import Panel
 
 from mcpcli.chat_handler import handle_chat_mode, get_input
-from mcpcli.config import load_config
+from mcpcli.config import load_config, read_config_file
+from mcpcli.daemon import (
+    DaemonError,
+    daemon_client,
+    daemon_lock,
+    daemon_paths,
+    is_daemon_locked,
+    is_daemon_running,
+    serve_daemon,
+)
 from mcpcli.messages.send_ping import send_ping
 from mcpcli.messages.send_prompts import send_prompts_list
 from mcpcli.messages.send_resources import send_resources_list
@@ -25,9 +37,27 @@ from mcpcli.messages.send_call_tool import send_call_tool
 from mcpcli.messages.send_tools_list import send_tools_list
 from mcpcli.transport.stdio.stdio_client import stdio_client
 
+# 優先使用 orjson 格式化 JSON 顯示內容,未安裝時退回標準庫 json。
+# orjson 無法序列化超過 64 位元的整數,遇到時改用標準庫輸出
+try:
+    import orjson
+
+    def _format_json(obj) -> str:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+        except orjson.JSONEncodeError:
+            return json.dumps(obj, indent=2, ensure_ascii=False)
+
+except ImportError:
+    def _format_json(obj) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
 # 預設設定檔路徑
 DEFAULT_CONFIG_FILE = "server_config.json"
 
+# 等待背景常駐程序開始接受連線的最長秒數
+DAEMON_START_TIMEOUT = 30
+
 # 設定logging
 logging.basicConfig(
     level=logging.CRITICAL,  # 設定logging等級為CRITICAL,只顯示嚴重錯誤
@@ -48,172 +78,20 @@ def signal_handler(sig, frame):
 # 設定訊號處理器,處理 SIGINT 信號 (Ctrl+C)
 signal.signal(signal.SIGINT, signal_handler)
 
-async def handle_command(command: str, server_streams: List[tuple]) -> bool:
-    """動態處理特定命令,支援多個伺服器。"""
-    try:
-        if command == "ping":
-            print("[cyan]\nPinging Servers...[/cyan]") # 顯示ping伺服器訊息
-            for i, (read_stream, write_stream) in enumerate(server_streams):
-                result = await send_ping(read_stream, write_stream) # 發送ping訊息到伺服器
-                server_num = i + 1
-                if result:
-                    ping_md = f"## Server {server_num} Ping Result\n\n✅ **Server is up and running**" # ping成功訊息
-                    print(Panel(Markdown(ping_md), style="bold green")) # 顯示綠色成功訊息面板
-                else:
-                    ping_md = f"## Server {server_num} Ping Result\n\n❌ **Server ping failed**" # ping失敗訊息
-                    print(Panel(Markdown(ping_md), style="bold red")) # 顯示紅色失敗訊息面板
-
-        elif command == "list-tools":
-            print("[cyan]\nFetching Tools List from all servers...[/cyan]") # 顯示獲取工具列表訊息
-            for i, (read_stream, write_stream) in enumerate(server_streams):
-                response = await send_tools_list(read_stream, write_stream) # 發送獲取工具列表訊息
-                tools_list = response.get("tools", []) # 從回應中獲取工具列表
-                server_num = i + 1
-
-                if not tools_list:
-                    tools_md = (
-                        f"## Server {server_num} Tools List\n\nNo tools available." # 沒有工具可用的訊息
-                    )
-                else:
-                    tools_md = f"## Server {server_num} Tools List\n\n" + "\n".join(
-                        [
-                            f"- **{t.get('name')}**: {t.get('description', 'No description')}" # 工具名稱和描述
-                            for t in tools_list
-                        ]
-                    )
-                print(
-                    Panel(
-                        Markdown(tools_md),
-                        title=f"Server {server_num} Tools", # 面板標題
-                        style="bold cyan", # 面板樣式
-                    )
-                )
-
-        elif command == "call-tool":
-            tool_name = await get_input("[bold magenta]Enter tool name[/bold magenta]") # 提示使用者輸入工具名稱
-            if not tool_name:
-                print("[red]Tool name cannot be empty.[/red]") # 工具名稱為空錯誤訊息
-                return True
-
-            arguments_str = await get_input("[bold magenta]Enter tool arguments as JSON (e.g., {'key': 'value'})[/bold magenta]") # 提示使用者輸入工具參數JSON
-            try:
-                arguments = json.loads(arguments_str) # 解析JSON參數
-            except json.JSONDecodeError as e:
-                print(f"[red]Invalid JSON arguments format:[/red] {e}") # JSON格式錯誤訊息
-                return True
-
-            print(f"[cyan]\nCalling tool '{tool_name}' with arguments:\n[/cyan]") # 顯示呼叫工具訊息
-            print(
-                Panel(
-                    Markdown(f"```json\n{json.dumps(arguments, indent=2)}\n```"), # 顯示JSON參數
-                    style="dim", # 面板樣式
-                )
-            )
-
-            for read_stream, write_stream in server_streams:
-                result = await send_call_tool(tool_name, arguments, read_stream, write_stream) # 發送呼叫工具訊息
-                if result.get("isError"):
-                    # print(f"[red]Error calling tool:[/red] {result.get('error')}")
-                    continue
-                response_content = result.get("content", "No content") # 獲取工具回應內容
-                try:
-                    if response_content[0]['text'].startswith('Error:'): # 檢查回應內容是否為錯誤訊息
-                        continue
-                except:
-                    pass
-                print(
-                    Panel(
-                        Markdown(f"### Tool Response\n\n{response_content}"), # 顯示工具回應內容
-                        style="green", # 面板樣式
-                    )
-                )
-
-        elif command == "list-resources":
-            print("[cyan]\nFetching Resources List from all servers...[/cyan]") # 顯示獲取資源列表訊息
-            for i, (read_stream, write_stream) in enumerate(server_streams):
-                response = await send_resources_list(read_stream, write_stream) # 發送獲取資源列表訊息
-                resources_list = response.get("resources", []) if response else None # 從回應中獲取資源列表
-                server_num = i + 1
-
-                if not resources_list:
-                    resources_md = f"## Server {server_num} Resources List\n\nNo resources available." # 沒有資源可用的訊息
-                else:
-                    resources_md = f"## Server {server_num} Resources List\n"
-                    for r in resources_list:
-                        if isinstance(r, dict):
-                            json_str = json.dumps(r, indent=2) # 將資源資訊轉換為JSON字串
-                            resources_md += f"\n```json\n{json_str}\n```" # 顯示JSON格式資源資訊
-                        else:
-                            resources_md += f"\n- {r}" # 顯示資源名稱
-                print(
-                    Panel(
-                        Markdown(resources_md),
-                        title=f"Server {server_num} Resources", # 面板標題
-                        style="bold cyan", # 面板樣式
-                    )
-                )
-
-        elif command == "list-prompts":
-            print("[cyan]\nFetching Prompts List from all servers...[/cyan]") # 顯示獲取提示列表訊息
-            for i, (read_stream, write_stream) in enumerate(server_streams):
-                response = await send_prompts_list(read_stream, write_stream) # 發送獲取提示列表訊息
-                prompts_list = response.get("prompts", []) if response else None # 從回應中獲取提示列表
-                server_num = i + 1
-
-                if not prompts_list:
-                    prompts_md = (
-                        f"## Server {server_num} Prompts List\n\nNo prompts available." # 沒有提示可用的訊息
-                    )
-                else:
-                    prompts_md = f"## Server {server_num} Prompts List\n\n" + "\n".join(
-                        [f"- {p}" for p in prompts_list] # 顯示提示名稱
-                    )
-                print(
-                    Panel(
-                        Markdown(prompts_md),
-                        title=f"Server {server_num} Prompts", # 面板標題
-                        style="bold cyan", # 面板樣式
-                    )
-                )
-
-        elif command == "chat":
-            provider = os.getenv("LLM_PROVIDER", "openai") # 獲取LLM提供者環境變數,預設為openai
-            model = os.getenv("LLM_MODEL", "gpt-4o-mini") # 獲取LLM模型環境變數,預設為gpt-4o-mini
-
-            # 先清除螢幕
-            if sys.platform == "win32":
-                os.system("cls") # Windows系統清除螢幕指令
-            else:
-                os.system("clear") # 其他系統清除螢幕指令
+# Windows 終端機預設未啟用 ANSI 跳脫序列,執行一次空指令即可啟用 VT 處理
+if sys.platform == "win32":
+    os.system("")
 
-            chat_info_text = (
-                "Welcome to the Chat!\n\n"
-                f"**Provider:** {provider}  |  **Model:** {model}\n\n" # 聊天模式資訊
-                "Type 'exit' to quit." # 退出聊天模式提示
-            )
+def _clear_screen():
+    """以 ANSI 跳脫序列清除螢幕並將游標移至左上角,避免每次都啟動 clear/cls 子程序。"""
+    sys.stdout.write("\x1b[2J\x1b[H")
+    sys.stdout.flush()
 
-            print(
-                Panel(
-                    Markdown(chat_info_text),
-                    style="bold cyan", # 面板樣式
-                    title="Chat Mode", # 面板標題
-                    title_align="center", # 標題對齊方式
-                )
-            )
-            await handle_chat_mode(server_streams, provider, model) # 進入聊天模式處理函式
-
-        elif command in ["quit", "exit"]:
-            print("\n[bold red]Goodbye![/bold red]") # 退出訊息
-            return False # 返回False,結束互動模式迴圈
-
-        elif command == "clear":
-            if sys.platform == "win32":
-                os.system("cls") # Windows系統清除螢幕指令
-            else:
-                os.system("clear") # 其他系統清除螢幕指令
+# 面板內容已是 Markdown 等 renderable,共用一個關閉自動語法高亮的 Console 輸出
+_CONSOLE = Console(highlight=False)
 
-        elif command == "help":
-            help_md = """
+# 靜態說明文字的面板只在匯入時建立一次,避免每次顯示都重新解析 Markdown
+HELP_MD = """
 # Available Commands
 
 - **ping**: Check if server is responsive # 檢查伺服器是否回應
@@ -227,8 +105,222 @@ async def handle_command(command: str, server_streams: List[tuple]) -> bool:
 
 **Note:** Commands use dashes (e.g., `list-tools` not `list tools`). # 注意:命令使用 dashes (例如:list-tools 而不是 list tools)
 """
-            print(Panel(Markdown(help_md), style="yellow")) # 顯示幫助訊息面板
 
+WELCOME_MD = """
+# Welcome to the Interactive MCP Command-Line Tool (Multi-Server Mode)
+
+Type 'help' for available commands or 'quit' to exit.
+"""
+
+_HELP_PANEL = Panel(Markdown(HELP_MD), style="yellow") # 幫助訊息面板
+_WELCOME_PANEL = Panel(Markdown(WELCOME_MD), style="bold cyan") # 歡迎訊息面板
+
+@functools.lru_cache(maxsize=8)
+def _chat_info_panel(provider: str, model: str) -> Panel:
+    """建立聊天模式資訊面板,依 (provider, model) 快取。"""
+    chat_info_text = (
+        "Welcome to the Chat!\n\n"
+        f"**Provider:** {provider}  |  **Model:** {model}\n\n" # 聊天模式資訊
+        "Type 'exit' to quit." # 退出聊天模式提示
+    )
+    return Panel(
+        Markdown(chat_info_text),
+        style="bold cyan", # 面板樣式
+        title="Chat Mode", # 面板標題
+        title_align="center", # 標題對齊方式
+    )
+
+async def _gather_per_server(server_streams: List[tuple], send_fn, *args) -> list:
+    """對所有伺服器平行發送請求,並依伺服器順序回傳結果(例外也會保留在對應位置)。"""
+    results = [None] * len(server_streams) # 依伺服器順序預先配置結果列表
+
+    async def _send_one(index: int, read_stream, write_stream):
+        try:
+            results[index] = await send_fn(*args, read_stream, write_stream)
+        except Exception as e:
+            results[index] = e
+
+    async with anyio.create_task_group() as tg:
+        for i, (read_stream, write_stream) in enumerate(server_streams):
+            tg.start_soon(_send_one, i, read_stream, write_stream)
+
+    return results
+
+def _iter_results(results: list):
+    """依伺服器順序逐一產生 (伺服器編號, 結果);遇到例外時重新拋出,與逐一等待時的行為一致。"""
+    for i, result in enumerate(results):
+        if isinstance(result, Exception):
+            raise result
+        yield i + 1, result
+
+async def _cmd_ping(server_streams: List[tuple]) -> None:
+    """對所有伺服器發送 ping 並顯示結果。"""
+    print("[cyan]\nPinging Servers...[/cyan]") # 顯示ping伺服器訊息
+    results = await _gather_per_server(server_streams, send_ping) # 平行發送ping訊息到所有伺服器
+    for server_num, result in _iter_results(results):
+        if result:
+            ping_md = f"## Server {server_num} Ping Result\n\n✅ **Server is up and running**" # ping成功訊息
+            _CONSOLE.print(Panel(Markdown(ping_md), style="bold green")) # 顯示綠色成功訊息面板
+        else:
+            ping_md = f"## Server {server_num} Ping Result\n\n❌ **Server ping failed**" # ping失敗訊息
+            _CONSOLE.print(Panel(Markdown(ping_md), style="bold red")) # 顯示紅色失敗訊息面板
+
+async def _cmd_list_tools(server_streams: List[tuple]) -> None:
+    """顯示所有伺服器的工具列表。"""
+    print("[cyan]\nFetching Tools List from all servers...[/cyan]") # 顯示獲取工具列表訊息
+    responses = await _gather_per_server(server_streams, send_tools_list) # 平行發送獲取工具列表訊息
+    for server_num, response in _iter_results(responses):
+        tools_list = response.get("tools", []) # 從回應中獲取工具列表
+
+        if not tools_list:
+            tools_md = (
+                f"## Server {server_num} Tools List\n\nNo tools available." # 沒有工具可用的訊息
+            )
+        else:
+            tools_md = f"## Server {server_num} Tools List\n\n" + "\n".join(
+                [
+                    f"- **{t.get('name')}**: {t.get('description', 'No description')}" # 工具名稱和描述
+                    for t in tools_list
+                ]
+            )
+        _CONSOLE.print(
+            Panel(
+                Markdown(tools_md),
+                title=f"Server {server_num} Tools", # 面板標題
+                style="bold cyan", # 面板樣式
+            )
+        )
+
+async def _cmd_call_tool(server_streams: List[tuple]) -> None:
+    """提示使用者輸入工具名稱與參數,並在所有伺服器上呼叫該工具。"""
+    tool_name = await get_input("[bold magenta]Enter tool name[/bold magenta]") # 提示使用者輸入工具名稱
+    if not tool_name:
+        print("[red]Tool name cannot be empty.[/red]") # 工具名稱為空錯誤訊息
+        return
+
+    arguments_str = await get_input("[bold magenta]Enter tool arguments as JSON (e.g., {'key': 'value'})[/bold magenta]") # 提示使用者輸入工具參數JSON
+    try:
+        arguments = json.loads(arguments_str) # 解析JSON參數
+    except json.JSONDecodeError as e:
+        print(f"[red]Invalid JSON arguments format:[/red] {e}") # JSON格式錯誤訊息
+        return
+
+    print(f"[cyan]\nCalling tool '{tool_name}' with arguments:\n[/cyan]") # 顯示呼叫工具訊息
+    _CONSOLE.print(
+        Panel(
+            Markdown(f"```json\n{arguments_str}\n```"), # 直接顯示使用者輸入的JSON參數,不再重新序列化
+            style="dim", # 面板樣式
+        )
+    )
+
+    results = await _gather_per_server(server_streams, send_call_tool, tool_name, arguments) # 平行發送呼叫工具訊息
+    for _, result in _iter_results(results):
+        if result.get("isError"):
+            # print(f"[red]Error calling tool:[/red] {result.get('error')}")
+            continue
+        response_content = result.get("content", "No content") # 獲取工具回應內容
+        try:
+            if response_content[0]['text'].startswith('Error:'): # 檢查回應內容是否為錯誤訊息
+                continue
+        except:
+            pass
+        _CONSOLE.print(
+            Panel(
+                Markdown(f"### Tool Response\n\n{response_content}"), # 顯示工具回應內容
+                style="green", # 面板樣式
+            )
+        )
+
+async def _cmd_list_resources(server_streams: List[tuple]) -> None:
+    """顯示所有伺服器的資源列表。"""
+    print("[cyan]\nFetching Resources List from all servers...[/cyan]") # 顯示獲取資源列表訊息
+    responses = await _gather_per_server(server_streams, send_resources_list) # 平行發送獲取資源列表訊息
+    for server_num, response in _iter_results(responses):
+        resources_list = response.get("resources", []) if response else None # 從回應中獲取資源列表
+
+        if not resources_list:
+            resources_md = f"## Server {server_num} Resources List\n\nNo resources available." # 沒有資源可用的訊息
+        else:
+            # 以列表收集各段再一次 join,避免在迴圈中重複串接字串
+            parts = [f"## Server {server_num} Resources List"]
+            for r in resources_list:
+                if isinstance(r, dict):
+                    json_str = _format_json(r) # 將資源資訊轉換為JSON字串
+                    parts.append(f"```json\n{json_str}\n```") # 顯示JSON格式資源資訊
+                else:
+                    parts.append(f"- {r}") # 顯示資源名稱
+            resources_md = "\n".join(parts)
+        _CONSOLE.print(
+            Panel(
+                Markdown(resources_md),
+                title=f"Server {server_num} Resources", # 面板標題
+                style="bold cyan", # 面板樣式
+            )
+        )
+
+async def _cmd_list_prompts(server_streams: List[tuple]) -> None:
+    """顯示所有伺服器的提示列表。"""
+    print("[cyan]\nFetching Prompts List from all servers...[/cyan]") # 顯示獲取提示列表訊息
+    responses = await _gather_per_server(server_streams, send_prompts_list) # 平行發送獲取提示列表訊息
+    for server_num, response in _iter_results(responses):
+        prompts_list = response.get("prompts", []) if response else None # 從回應中獲取提示列表
+
+        if not prompts_list:
+            prompts_md = (
+                f"## Server {server_num} Prompts List\n\nNo prompts available." # 沒有提示可用的訊息
+            )
+        else:
+            prompts_md = f"## Server {server_num} Prompts List\n\n" + "\n".join(
+                [f"- {p}" for p in prompts_list] # 顯示提示名稱
+            )
+        _CONSOLE.print(
+            Panel(
+                Markdown(prompts_md),
+                title=f"Server {server_num} Prompts", # 面板標題
+                style="bold cyan", # 面板樣式
+            )
+        )
+
+async def _cmd_chat(server_streams: List[tuple]) -> None:
+    """進入聊天模式。"""
+    provider = os.getenv("LLM_PROVIDER", "openai") # 獲取LLM提供者環境變數,預設為openai
+    model = os.getenv("LLM_MODEL", "gpt-4o-mini") # 獲取LLM模型環境變數,預設為gpt-4o-mini
+
+    # 先清除螢幕
+    _clear_screen()
+
+    _CONSOLE.print(_chat_info_panel(provider, model)) # 顯示聊天模式資訊面板
+    await handle_chat_mode(server_streams, provider, model) # 進入聊天模式處理函式
+
+async def _cmd_clear(server_streams: List[tuple]) -> None:
+    """清除螢幕。"""
+    _clear_screen()
+
+async def _cmd_help(server_streams: List[tuple]) -> None:
+    """顯示幫助訊息。"""
+    _CONSOLE.print(_HELP_PANEL) # 顯示幫助訊息面板
+
+# 命令名稱對應處理函式,以字典查表取代 if/elif 串列
+_COMMANDS = {
+    "ping": _cmd_ping,
+    "list-tools": _cmd_list_tools,
+    "call-tool": _cmd_call_tool,
+    "list-resources": _cmd_list_resources,
+    "list-prompts": _cmd_list_prompts,
+    "chat": _cmd_chat,
+    "clear": _cmd_clear,
+    "help": _cmd_help,
+}
+
+async def handle_command(command: str, server_streams: List[tuple]) -> bool:
+    """動態處理特定命令,支援多個伺服器。"""
+    try:
+        handler = _COMMANDS.get(command)
+        if handler:
+            await handler(server_streams) # 執行對應的命令處理函式
+        elif command in ("quit", "exit"):
+            print("\n[bold red]Goodbye![/bold red]") # 退出訊息
+            return False # 返回False,結束互動模式迴圈
         else:
             print(f"[red]\nUnknown command: {command}[/red]") # 未知命令錯誤訊息
             print("[yellow]Type 'help' for available commands[/yellow]") # 顯示幫助提示
@@ -239,12 +331,7 @@ async def handle_command(command: str, server_streams: List[tuple]) -> bool:
 
 async def interactive_mode(server_streams: List[tuple]):
     """以互動模式執行 CLI,支援多個伺服器。"""
-    welcome_text = """
-# Welcome to the Interactive MCP Command-Line Tool (Multi-Server Mode)
-
-Type 'help' for available commands or 'quit' to exit.
-"""
-    print(Panel(Markdown(welcome_text), style="bold cyan")) # 顯示歡迎訊息面板
+    _CONSOLE.print(_WELCOME_PANEL) # 顯示歡迎訊息面板
 
     while True: # 互動模式主迴圈
         try:
@@ -264,43 +351,158 @@ class GracefulExit(Exception):
     """自訂例外處理,用於優雅退出。"""
     pass
 
+async def _serve_server(
+    server_params,
+    shutdown: anyio.Event,
+    *,
+    task_status: anyio.abc.TaskStatus = anyio.TASK_STATUS_IGNORED,
+) -> None:
+    """在獨立任務中維持單一伺服器的 stdio 連線並完成初始化,直到收到關閉通知。"""
+    async with stdio_client(server_params) as (read_stream, write_stream): # 建立stdio通訊
+        init_result = await send_initialize(read_stream, write_stream) # 發送初始化訊息
+        task_status.started((read_stream, write_stream, init_result)) # 回報stream與初始化結果
+        await shutdown.wait() # 等待關閉通知
+        await write_stream.aclose() # 關閉寫入stream,讓stdin_writer結束
+
+async def _start_server(
+    tg: anyio.abc.TaskGroup,
+    server_params,
+    shutdown: anyio.Event,
+    results: list,
+    index: int,
+) -> None:
+    """啟動單一伺服器,並將結果存入 results 中對應的位置以保持原始順序。"""
+    try:
+        results[index] = await tg.start(_serve_server, server_params, shutdown)
+    except Exception as e:
+        results[index] = e # 保留例外,由 run() 統一回報
+
+async def _bring_up(
+    tg: anyio.abc.TaskGroup,
+    server_names: List[str],
+    server_params_list: list,
+    shutdown: anyio.Event,
+) -> Optional[List[tuple]]:
+    """平行建立並初始化所有伺服器,依設定順序回傳 streams;任一伺服器失敗時回傳 None。"""
+    results = [None] * len(server_params_list) # 依伺服器順序預先配置結果列表
+
+    # 平行建立 stdio 通訊並初始化所有伺服器,讓握手延遲彼此重疊
+    async with anyio.create_task_group() as init_tg:
+        for i, server_params in enumerate(server_params_list):
+            init_tg.start_soon(_start_server, tg, server_params, shutdown, results, i)
+
+    # 依原始順序檢查初始化結果
+    server_streams = [] # 儲存伺服器stream的列表
+    for server_name, result in zip(server_names, results):
+        if isinstance(result, Exception):
+            print(f"[red]Server initialization failed for {server_name}:[/red] {result}") # 顯示伺服器啟動錯誤
+            return None
+        read_stream, write_stream, init_result = result
+        if not init_result: # 如果初始化失敗
+            print(f"[red]Server initialization failed for {server_name}[/red]") # 顯示伺服器初始化失敗訊息
+            return None
+        server_streams.append((read_stream, write_stream)) # 添加stream到列表
+
+    return server_streams
+
+def _tear_down(tg: anyio.abc.TaskGroup, shutdown: anyio.Event) -> None:
+    """通知所有伺服器任務關閉,並最多等待 1 秒。"""
+    tg.cancel_scope.deadline = anyio.current_time() + 1 # 等待最多 1 秒
+    shutdown.set() # 通知所有伺服器任務關閉
+
 async def run(config_path: str, server_names: List[str], command: str = None) -> None:
     """主函式,管理伺服器初始化、通訊和關閉。"""
     # 在渲染任何內容之前清除螢幕
-    if sys.platform == "win32":
-        os.system("cls") # Windows系統清除螢幕指令
-    else:
-        os.system("clear") # 其他系統清除螢幕指令
+    _clear_screen()
 
-    # 載入伺服器設定並為所有伺服器建立連線
-    server_streams = [] # 儲存伺服器stream的列表
-    context_managers = [] # 儲存context manager的列表
-    for server_name in server_names: # 迭代伺服器名稱列表
-        server_params = await load_config(config_path, server_name) # 載入伺服器設定
-
-        # 為每個伺服器建立 stdio 通訊
-        cm = stdio_client(server_params) # 建立stdio client context manager
-        (read_stream, write_stream) = await cm.__aenter__() # 進入context manager,獲取stream
-        context_managers.append(cm) # 添加context manager到列表
-        server_streams.append((read_stream, write_stream)) # 添加stream到列表
+    # 載入所有伺服器設定
+    server_params_list = [
+        await load_config(config_path, server_name) for server_name in server_names
+    ]
 
-        init_result = await send_initialize(read_stream, write_stream) # 發送初始化訊息
-        if not init_result: # 如果初始化失敗
-            print(f"[red]Server initialization failed for {server_name}[/red]") # 顯示伺服器初始化失敗訊息
-            return # 退出函式
+    shutdown = anyio.Event() # 通知所有伺服器任務關閉
+    async with anyio.create_task_group() as tg:
+        try:
+            server_streams = await _bring_up(tg, server_names, server_params_list, shutdown)
+            if server_streams is None:
+                return # 初始化失敗,退出函式
+
+            if command:
+                # 單一命令模式
+                await handle_command(command, server_streams) # 處理單一命令
+            else:
+                # 互動模式
+                await interactive_mode(server_streams) # 進入互動模式
+        finally:
+            # 清理所有 streams
+            _tear_down(tg, shutdown)
+
+async def serve_persistent(config_path: str, server_names: List[str]) -> None:
+    """常駐程序:初始化所有伺服器後保持連線,透過 UNIX socket 提供給後續的 CLI 呼叫重用。"""
+    socket_path, pid_path = daemon_paths(config_path, server_names)
+    server_params_list = [
+        await load_config(config_path, server_name) for server_name in server_names
+    ]
+
+    with daemon_lock(pid_path) as acquired:
+        if not acquired:
+            # 已有其他常駐程序服務相同的設定,直接結束
+            logging.info(f"Daemon already running for {pid_path}")
+            return
+
+        shutdown = anyio.Event()
+        async with anyio.create_task_group() as tg:
+            try:
+                server_streams = await _bring_up(tg, server_names, server_params_list, shutdown)
+                if server_streams is None:
+                    return
+                await serve_daemon(socket_path, server_streams) # 持續服務直到程序被終止
+            finally:
+                _tear_down(tg, shutdown)
+
+def _spawn_daemon(config_path: str, server_names: List[str]) -> subprocess.Popen:
+    """在獨立的 session 中於背景啟動常駐程序。"""
+    cmd = [sys.executable, "-m", "mcpcli", "--config-file", os.path.abspath(config_path), "--serve-daemon"]
+    for server_name in server_names:
+        cmd += ["--server", server_name]
+    return subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True, # 與目前終端機分離,不受 Ctrl+C 影響
+    )
+
+async def run_persistent(config_path: str, server_names: List[str], command: str = None) -> None:
+    """透過常駐程序執行命令;第一次呼叫時在背景啟動常駐程序,之後的呼叫直接重用已初始化的伺服器連線。"""
+    socket_path, pid_path = daemon_paths(config_path, server_names)
+
+    if not await is_daemon_running(socket_path):
+        print("[cyan]Starting persistent server session...[/cyan]") # 顯示啟動常駐程序訊息
+        daemon = _spawn_daemon(config_path, server_names)
+        with anyio.move_on_after(DAEMON_START_TIMEOUT): # 等待常駐程序開始接受連線
+            while not await is_daemon_running(socket_path):
+                # 常駐程序已結束且沒有其他常駐程序正在啟動,代表初始化失敗
+                if daemon.poll() is not None and not is_daemon_locked(pid_path):
+                    break
+                await anyio.sleep(0.1)
+        if not await is_daemon_running(socket_path):
+            print("[red]Failed to start persistent server session.[/red]") # 顯示啟動失敗訊息
+            return
+
+    # 在渲染任何內容之前清除螢幕
+    _clear_screen()
 
     try:
-        if command:
-            # 單一命令模式
-            await handle_command(command, server_streams) # 處理單一命令
-        else:
-            # 互動模式
-            await interactive_mode(server_streams) # 進入互動模式
-    finally:
-        # 清理所有 streams
-        for cm in context_managers: # 迭代context manager列表
-            with anyio.move_on_after(1):  # 等待最多 1 秒
-                await cm.__aexit__() # 退出context manager,清理stream
+        async with daemon_client(socket_path, len(server_names)) as server_streams:
+            if command:
+                # 單一命令模式
+                await handle_command(command, server_streams) # 處理單一命令
+            else:
+                # 互動模式
+                await interactive_mode(server_streams) # 進入互動模式
+    except DaemonError as e:
+        print(f"[red]{e}[/red]") # 常駐程序正忙或拒絕連線
 
 def cli_main():
     # 設定命令列解析器
@@ -327,6 +529,20 @@ def cli_main():
         default=False # 預設值為 False
     )
 
+    parser.add_argument(
+        "--persist",
+        action="store_true", # 設定為store_true,當命令列中出現 --persist 時,值為 True
+        default=False, # 預設值為 False
+        help="Keep server sessions alive in a background process and reuse them across invocations.", # 幫助訊息
+    )
+
+    parser.add_argument(
+        "--serve-daemon",
+        action="store_true",
+        default=False,
+        help=argparse.SUPPRESS, # 內部使用:以常駐程序模式執行
+    )
+
     parser.add_argument(
         "command",
         nargs="?", # 參數數量為0或1
@@ -359,9 +575,16 @@ def cli_main():
 
     try:
         if args.all: # 如果使用了 --all 參數
-            with open(args.config_file, 'r', encoding='UTF-8') as f: # 開啟設定檔
-                args.servers=list(json.load(f)['mcpServers'].keys())                
-        result = anyio.run(run, args.config_file, args.servers, args.command) # 執行主函式 run
+            config = read_config_file(args.config_file) # 讀取設定檔(與 load_config 共用快取)
+            args.servers = list(config['mcpServers'].keys())
+        if args.serve_daemon:
+            result = anyio.run(serve_persistent, args.config_file, args.servers) # 以常駐程序模式執行
+        elif args.persist:
+            if sys.platform == "win32":
+                raise RuntimeError("--persist requires UNIX domain sockets and is not supported on Windows.")
+            result = anyio.run(run_persistent, args.config_file, args.servers, args.command) # 透過常駐程序執行
+        else:
+            result = anyio.run(run, args.config_file, args.servers, args.command) # 執行主函式 run
         sys.exit(result) # 退出程式,返回執行結果
     except Exception as e: # 捕獲異常
         print(f"[red]Error occurred:[/red] {e}") # 顯示錯誤訊息
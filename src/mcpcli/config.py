@@ -1,19 +1,26 @@
 # config.py
+import functools
 import json
 import logging
 
 from mcpcli.transport.stdio.stdio_server_parameters import StdioServerParameters
 
 
+@functools.lru_cache(maxsize=8)
+def read_config_file(config_path: str) -> dict:
+    """Read and parse a JSON configuration file, cached per path."""
+    with open(config_path, "r", encoding="utf-8") as config_file:
+        return json.load(config_file)
+
+
 async def load_config(config_path: str, server_name: str) -> StdioServerParameters:
     """Load the server configuration from a JSON file."""
     try:
         # debug
         logging.debug(f"Loading config from {config_path}")
 
-        # Read the configuration file
-        with open(config_path, "r",encoding="utf-8") as config_file:
-            config = json.load(config_file)
+        # Read the configuration file (parsed once per path)
+        config = read_config_file(config_path)
 
         # Retrieve the server configuration
         server_config = config.get("mcpServers", {}).get(server_name)
@@ -27,6 +34,7 @@ async def load_config(config_path: str, server_name: str) -> StdioServerParamete
             command=server_config["command"],
             args=server_config.get("args", []),
             env=server_config.get("env"),
+            framing=server_config.get("framing", "newline"),
         )
 
         # debug
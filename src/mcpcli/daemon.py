@@ -0,0 +1,337 @@
+# daemon.py
+import hashlib
+import json
+import logging
+import os
+import signal
+from collections import Counter
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import anyio
+from anyio.streams.buffered import BufferedByteReceiveStream
+
+from mcpcli.config import read_config_file
+from mcpcli.messages.message_types.json_rpc_message import JSONRPCMessage
+from mcpcli.transport.stdio.stdio_client import JSONRPC_ADAPTER, READ_STREAM_BUFFER_SIZE, parse_json
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: --persist is not supported there, so the daemon lock is never used
+    fcntl = None
+
+# Directory holding the daemon sockets and PID files
+DAEMON_DIR = Path("~/.cache/mcpcli").expanduser()
+
+# Seconds without a client after which a daemon shuts down, so daemons
+# left behind by config edits do not keep their servers running forever
+DAEMON_IDLE_TIMEOUT = 30 * 60
+
+# Upper bound on a single frame exchanged over the daemon socket
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+# Handshake: a client opens with a hello line (bare liveness probes never
+# send one) and the daemon answers with a ready or error status line
+_HELLO_FRAME = b'{"status":"hello"}\n'
+_READY_FRAME = b'{"status":"ready"}\n'
+_BUSY_FRAME = b'{"error":"Persistent session is busy: another client is connected."}\n'
+
+
+class DaemonError(RuntimeError):
+    """Raised by daemon_client when the daemon refuses the connection, e.g. while it is busy."""
+
+
+def daemon_paths(config_path: str, server_names: List[str]) -> Tuple[Path, Path]:
+    """
+    Return the (socket, pid file) paths of the daemon serving the given servers.
+
+    Each distinct config file / server selection gets its own daemon, so the
+    paths are keyed by a short hash of both. The selected servers' config
+    entries are part of the key too, so editing a server's command, args,
+    env or framing starts a fresh daemon instead of reusing the stale one.
+    """
+    servers = read_config_file(config_path).get("mcpServers", {})
+    entries = [servers.get(name) for name in server_names]
+    key = json.dumps([os.path.abspath(config_path), list(server_names), entries], sort_keys=True)
+    digest = hashlib.sha256(key.encode()).hexdigest()[:12]
+    return DAEMON_DIR / f"daemon-{digest}.sock", DAEMON_DIR / f"daemon-{digest}.pid"
+
+
+def _encode_frame(server_index: int, message: JSONRPCMessage) -> bytes:
+    # Same serializer as stdio_client; compact JSON never contains a raw newline
+    payload = message.__pydantic_serializer__.to_json(message, exclude_none=True)
+    return b'{"server":%d,"message":%s}\n' % (server_index, payload)
+
+
+def _decode_frame(line: bytes) -> Tuple[int, JSONRPCMessage]:
+    frame = parse_json(line)
+    return frame["server"], JSONRPC_ADAPTER.validate_python(frame["message"])
+
+
+async def _read_frames(buffered: BufferedByteReceiveStream):
+    """Yield (server index, message) pairs from a newline-delimited frame stream."""
+    while True:
+        try:
+            line = await buffered.receive_until(b"\n", MAX_FRAME_BYTES)
+        except (anyio.IncompleteRead, anyio.EndOfStream, anyio.BrokenResourceError):
+            return
+        yield _decode_frame(line)
+
+
+@contextmanager
+def daemon_lock(pid_path: Path):
+    """
+    Hold the exclusive lock on the PID file that makes this process the only
+    daemon for it.
+
+    Yields True once the lock is taken and the PID file records this process,
+    or False when another daemon already holds it. The PID file is removed
+    before the lock is released, so a daemon never deletes files that belong
+    to another one.
+    """
+    DAEMON_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+    while True:
+        fd = os.open(pid_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            yield False
+            return
+        # The previous owner may have removed the file between our open and flock
+        try:
+            if os.stat(pid_path).st_ino == os.fstat(fd).st_ino:
+                break
+        except FileNotFoundError:
+            pass
+        os.close(fd)
+
+    try:
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{os.getpid()}\n".encode())
+        yield True
+    finally:
+        pid_path.unlink(missing_ok=True)
+        os.close(fd)
+
+
+def is_daemon_locked(pid_path: Path) -> bool:
+    """Check whether a daemon (possibly still starting up) holds the PID file lock."""
+    try:
+        fd = os.open(pid_path, os.O_RDONLY)
+    except FileNotFoundError:
+        return False
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    finally:
+        os.close(fd)
+    return False
+
+
+async def is_daemon_running(socket_path: Path) -> bool:
+    """Check whether a daemon is accepting connections on the socket."""
+    try:
+        stream = await anyio.connect_unix(socket_path)
+    except OSError:
+        return False
+    await stream.aclose()
+    return True
+
+
+async def serve_daemon(
+    socket_path: Path,
+    server_streams: List[tuple],
+    idle_timeout: Optional[float] = DAEMON_IDLE_TIMEOUT,
+) -> None:
+    """
+    Expose already-initialized server sessions over a UNIX socket.
+
+    Clients are served one at a time; a client connecting while another one
+    is served is rejected straight away. Each client's JSON-RPC messages are
+    forwarded to the addressed server's write stream, and every message read
+    from the servers is forwarded back to the client, tagged with its server
+    index.
+
+    Requests a client leaves unanswered when it disconnects are remembered,
+    and their late responses are dropped instead of reaching the next client.
+
+    Serving stops on SIGTERM/SIGHUP, or once no client has been connected for
+    idle_timeout seconds.
+
+    Must be called while holding daemon_lock() for the matching PID file: the
+    listener replaces any stale socket left at socket_path, which is only safe
+    when no other daemon can be serving it.
+
+    Args:
+        socket_path (Path): Path of the UNIX socket to listen on.
+        server_streams (List[tuple]): (read_stream, write_stream) per server.
+        idle_timeout (Optional[float]): Seconds without a client before
+            shutting down, or None to serve until signalled.
+    """
+    DAEMON_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+    client_lock = anyio.Lock()
+    # Per server: ids of requests forwarded for the current client and still
+    # unanswered, and ids abandoned by earlier clients. Clients number their
+    # requests from 1 in every process, so abandoned ids are counted rather
+    # than stored once, and each one drops exactly one response.
+    pending = [set() for _ in server_streams]
+    abandoned = [Counter() for _ in server_streams]
+    last_client_at = anyio.current_time()
+
+    def is_stale(index: int, message: JSONRPCMessage) -> bool:
+        """Account for a server message; True if it answers an abandoned request."""
+        if message.method is not None or message.id is None:
+            return False
+        if abandoned[index][message.id] > 0:
+            abandoned[index][message.id] -= 1
+            if not abandoned[index][message.id]:
+                del abandoned[index][message.id]
+            return True
+        pending[index].discard(message.id)
+        return False
+
+    async def forward_responses(client: anyio.abc.SocketStream, send_lock: anyio.Lock, index: int, read_stream):
+        try:
+            async for message in read_stream:
+                if is_stale(index, message):
+                    logging.debug(f"Dropping response to abandoned request {message.id}")
+                    continue
+                async with send_lock:
+                    await client.send(_encode_frame(index, message))
+        except (anyio.BrokenResourceError, anyio.ClosedResourceError):
+            # Client went away; the session handler cancels us shortly
+            pass
+
+    async def stop_when_idle(scope: anyio.CancelScope):
+        while True:
+            if client_lock.locked():
+                deadline = anyio.current_time() + idle_timeout
+            else:
+                deadline = last_client_at + idle_timeout
+            if anyio.current_time() >= deadline:
+                logging.info(f"Daemon idle for {idle_timeout}s, shutting down")
+                scope.cancel()
+                return
+            await anyio.sleep_until(deadline)
+
+    async def handle_client(client: anyio.abc.SocketStream):
+        nonlocal last_client_at
+        async with client:
+            buffered = BufferedByteReceiveStream(client)
+            try:
+                await buffered.receive_until(b"\n", MAX_FRAME_BYTES)
+            except (anyio.IncompleteRead, anyio.EndOfStream, anyio.BrokenResourceError):
+                # Liveness probe from is_daemon_running, or the client gave up
+                return
+
+            if client_lock.locked():
+                # Reject right away instead of leaving the client waiting on the lock
+                logging.debug("Daemon busy, rejecting client")
+                try:
+                    await client.send(_BUSY_FRAME)
+                except (anyio.BrokenResourceError, anyio.ClosedResourceError):
+                    pass
+                return
+
+            async with client_lock:
+                logging.debug("Daemon client connected")
+                try:
+                    await client.send(_READY_FRAME)
+
+                    # Drop messages that arrived while no client was connected
+                    for i, (read_stream, _) in enumerate(server_streams):
+                        while True:
+                            try:
+                                is_stale(i, read_stream.receive_nowait())
+                            except (anyio.WouldBlock, anyio.EndOfStream):
+                                break
+
+                    send_lock = anyio.Lock()
+                    async with anyio.create_task_group() as tg:
+                        for i, (read_stream, _) in enumerate(server_streams):
+                            tg.start_soon(forward_responses, client, send_lock, i, read_stream)
+
+                        async for index, message in _read_frames(buffered):
+                            if message.method is not None and message.id is not None:
+                                pending[index].add(message.id)
+                            await server_streams[index][1].send(message)
+
+                        tg.cancel_scope.cancel()
+                except Exception as e:
+                    # A misbehaving client must not take the daemon down
+                    logging.error(f"Error serving daemon client: {e}")
+                finally:
+                    # Whatever the client left unanswered must not reach the next client
+                    for i in range(len(server_streams)):
+                        abandoned[i].update(pending[i])
+                        pending[i].clear()
+                    last_client_at = anyio.current_time()
+                logging.debug("Daemon client disconnected")
+
+    listener = await anyio.create_unix_listener(socket_path, mode=0o600)
+    try:
+        logging.info(f"Daemon listening on {socket_path}")
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(listener.serve, handle_client)
+            if idle_timeout is not None:
+                tg.start_soon(stop_when_idle, tg.cancel_scope)
+
+            # Stop serving on SIGTERM/SIGHUP so the socket and PID file are cleaned up
+            with anyio.open_signal_receiver(signal.SIGTERM, signal.SIGHUP) as signals:
+                async for signum in signals:
+                    logging.info(f"Daemon received signal {signum}, shutting down")
+                    tg.cancel_scope.cancel()
+                    break
+    finally:
+        await listener.aclose()
+        socket_path.unlink(missing_ok=True)
+
+
+@asynccontextmanager
+async def daemon_client(socket_path: Path, server_count: int):
+    """
+    Connect to a running daemon and yield per-server (read_stream, write_stream)
+    pairs that behave like the streams returned by stdio_client.
+
+    Raises DaemonError if the daemon is busy serving another client.
+    """
+    stream = await anyio.connect_unix(socket_path)
+    buffered = BufferedByteReceiveStream(stream)
+
+    # Wait for the daemon to accept us before proxying anything
+    try:
+        await stream.send(_HELLO_FRAME)
+        status = parse_json(await buffered.receive_until(b"\n", MAX_FRAME_BYTES))
+    except (anyio.IncompleteRead, anyio.EndOfStream, anyio.BrokenResourceError):
+        status = {"error": "Persistent session closed the connection."}
+    if "error" in status:
+        await stream.aclose()
+        raise DaemonError(status["error"])
+
+    readers = [anyio.create_memory_object_stream(READ_STREAM_BUFFER_SIZE) for _ in range(server_count)]
+    writers = [anyio.create_memory_object_stream(0) for _ in range(server_count)]
+    send_lock = anyio.Lock()
+
+    async def socket_reader():
+        async for index, message in _read_frames(buffered):
+            await readers[index][0].send(message)
+        for reader_writer, _ in readers:
+            await reader_writer.aclose()
+
+    async def socket_writer(index: int, write_stream_reader):
+        async for message in write_stream_reader:
+            async with send_lock:
+                await stream.send(_encode_frame(index, message))
+
+    async with stream, anyio.create_task_group() as tg:
+        tg.start_soon(socket_reader)
+        for i, (_, write_stream_reader) in enumerate(writers):
+            tg.start_soon(socket_writer, i, write_stream_reader)
+
+        yield [(readers[i][1], writers[i][0]) for i in range(server_count)]
+
+        tg.cancel_scope.cancel()
@@ -0,0 +1,44 @@
+# tests/test_config.py
+import json
+from unittest.mock import patch
+
+import pytest
+
+from mcpcli.config import load_config, read_config_file
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "server_config.json"
+    path.write_text(
+        json.dumps(
+            {
+                "mcpServers": {
+                    "sqlite": {"command": "uvx", "args": ["mcp-server-sqlite"]},
+                    "echo": {"command": "python", "env": {"DEBUG": "1"}},
+                }
+            }
+        ),
+        encoding="utf-8",
+    )
+    read_config_file.cache_clear()
+    yield str(path)
+    read_config_file.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_load_config_parses_file_once(config_path):
+    with patch("mcpcli.config.json.load", wraps=json.load) as mock_load:
+        sqlite = await load_config(config_path, "sqlite")
+        echo = await load_config(config_path, "echo")
+
+    assert mock_load.call_count == 1
+    assert sqlite.command == "uvx"
+    assert sqlite.args == ["mcp-server-sqlite"]
+    assert echo.env == {"DEBUG": "1"}
+
+
+@pytest.mark.asyncio
+async def test_load_config_unknown_server(config_path):
+    with pytest.raises(ValueError, match="Server 'missing' not found"):
+        await load_config(config_path, "missing")
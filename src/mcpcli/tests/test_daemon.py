@@ -0,0 +1,210 @@
+# tests/test_daemon.py
+import json
+import os
+import sys
+
+import anyio
+import pytest
+
+from mcpcli import daemon
+from mcpcli.config import read_config_file
+from mcpcli.daemon import (
+    DaemonError,
+    daemon_client,
+    daemon_lock,
+    daemon_paths,
+    is_daemon_locked,
+    is_daemon_running,
+    serve_daemon,
+)
+from mcpcli.messages.message_types.json_rpc_message import JSONRPCMessage
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="UNIX sockets only")
+
+
+async def _fake_server(name: str, requests, responses):
+    """Answer every request with a result naming this server and the method."""
+    async for message in requests:
+        await responses.send(
+            JSONRPCMessage(id=message.id, result={"server": name, "method": message.method})
+        )
+
+
+async def _slow_tools_server(requests, responses):
+    """Like _fake_server, but take a while to answer tools/list."""
+    async def answer(message):
+        if message.method == "tools/list":
+            await anyio.sleep(0.3)
+        await responses.send(JSONRPCMessage(id=message.id, result={"method": message.method}))
+
+    async with anyio.create_task_group() as tg:
+        async for message in requests:
+            tg.start_soon(answer, message)
+
+
+def test_daemon_paths_are_keyed_by_config_and_servers(tmp_path):
+    config_path = tmp_path / "server_config.json"
+    servers = {
+        "sqlite": {"command": "uvx", "args": ["mcp-server-sqlite"]},
+        "echo": {"command": "python"},
+    }
+    config_path.write_text(json.dumps({"mcpServers": servers}), encoding="utf-8")
+    config = str(config_path)
+    read_config_file.cache_clear()
+
+    socket_a, pid_a = daemon_paths(config, ["sqlite"])
+    socket_b, _ = daemon_paths(config, ["sqlite", "echo"])
+
+    assert socket_a == daemon_paths(config, ["sqlite"])[0]
+    assert socket_a != socket_b
+    assert socket_a.suffix == ".sock" and pid_a.suffix == ".pid"
+
+    # Editing a selected server's entry keys a new daemon; other entries do not
+    servers["echo"]["env"] = {"DEBUG": "1"}
+    config_path.write_text(json.dumps({"mcpServers": servers}), encoding="utf-8")
+    read_config_file.cache_clear()
+    assert daemon_paths(config, ["sqlite"])[0] == socket_a
+
+    servers["sqlite"]["args"].append("--db-path=test.db")
+    config_path.write_text(json.dumps({"mcpServers": servers}), encoding="utf-8")
+    read_config_file.cache_clear()
+    assert daemon_paths(config, ["sqlite"])[0] != socket_a
+    read_config_file.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_daemon_proxies_messages_per_server(tmp_path, monkeypatch):
+    monkeypatch.setattr(daemon, "DAEMON_DIR", tmp_path)
+    socket_path = tmp_path / "d.sock"
+
+    async with anyio.create_task_group() as tg:
+        server_streams = []
+        for name in ("a", "b"):
+            responses_send, responses_receive = anyio.create_memory_object_stream(10)
+            requests_send, requests_receive = anyio.create_memory_object_stream(0)
+            tg.start_soon(_fake_server, name, requests_receive, responses_send)
+            server_streams.append((responses_receive, requests_send))
+        tg.start_soon(serve_daemon, socket_path, server_streams)
+
+        with anyio.fail_after(5):
+            while not await is_daemon_running(socket_path):
+                await anyio.sleep(0.01)
+
+            # Two clients in a row reuse the same server sessions
+            for request_id in ("1", "2"):
+                async with daemon_client(socket_path, 2) as client_streams:
+                    for (read_stream, write_stream), name in zip(client_streams, ("a", "b")):
+                        await write_stream.send(JSONRPCMessage(id=request_id, method="ping"))
+                        response = await read_stream.receive()
+                        assert response.id == request_id
+                        assert response.result == {"server": name, "method": "ping"}
+
+        tg.cancel_scope.cancel()
+
+    assert not socket_path.exists()
+
+
+def test_daemon_lock_allows_a_single_owner(tmp_path, monkeypatch):
+    monkeypatch.setattr(daemon, "DAEMON_DIR", tmp_path)
+    pid_path = tmp_path / "d.pid"
+
+    with daemon_lock(pid_path) as acquired:
+        assert acquired
+        assert pid_path.read_text() == f"{os.getpid()}\n"
+        assert is_daemon_locked(pid_path)
+
+        # A second daemon backs off and leaves the owner's PID file alone
+        with daemon_lock(pid_path) as second:
+            assert not second
+        assert pid_path.exists()
+
+    assert not pid_path.exists()
+    assert not is_daemon_locked(pid_path)
+
+
+@pytest.mark.asyncio
+async def test_daemon_rejects_second_client_while_busy(tmp_path, monkeypatch):
+    monkeypatch.setattr(daemon, "DAEMON_DIR", tmp_path)
+    socket_path = tmp_path / "d.sock"
+
+    async with anyio.create_task_group() as tg:
+        responses_send, responses_receive = anyio.create_memory_object_stream(10)
+        requests_send, requests_receive = anyio.create_memory_object_stream(0)
+        tg.start_soon(_fake_server, "a", requests_receive, responses_send)
+        tg.start_soon(serve_daemon, socket_path, [(responses_receive, requests_send)])
+
+        with anyio.fail_after(5):
+            while not await is_daemon_running(socket_path):
+                await anyio.sleep(0.01)
+
+            async with daemon_client(socket_path, 1):
+                with pytest.raises(DaemonError, match="busy"):
+                    async with daemon_client(socket_path, 1):
+                        pass
+
+            # Once the first client leaves, the next one is served
+            async with daemon_client(socket_path, 1) as [(read_stream, write_stream)]:
+                await write_stream.send(JSONRPCMessage(id="1", method="ping"))
+                assert (await read_stream.receive()).result == {"server": "a", "method": "ping"}
+
+        tg.cancel_scope.cancel()
+
+
+@pytest.mark.asyncio
+async def test_daemon_drops_responses_to_abandoned_requests(tmp_path, monkeypatch):
+    monkeypatch.setattr(daemon, "DAEMON_DIR", tmp_path)
+    socket_path = tmp_path / "d.sock"
+
+    async with anyio.create_task_group() as tg:
+        responses_send, responses_receive = anyio.create_memory_object_stream(10)
+        requests_send, requests_receive = anyio.create_memory_object_stream(0)
+        tg.start_soon(_slow_tools_server, requests_receive, responses_send)
+        tg.start_soon(serve_daemon, socket_path, [(responses_receive, requests_send)])
+
+        with anyio.fail_after(5):
+            while not await is_daemon_running(socket_path):
+                await anyio.sleep(0.01)
+
+            # The first client gives up before its tools/list is answered
+            async with daemon_client(socket_path, 1) as [(_, write_stream)]:
+                await write_stream.send(JSONRPCMessage(id="tools-list-1", method="tools/list"))
+                await anyio.sleep(0.1)
+            await anyio.sleep(0.05)
+
+            async with daemon_client(socket_path, 1) as [(read_stream, write_stream)]:
+                # Let the late tools/list answer arrive while this client is connected
+                await anyio.sleep(0.3)
+                await write_stream.send(JSONRPCMessage(id="resources-list-1", method="resources/list"))
+                assert (await read_stream.receive()).id == "resources-list-1"
+
+                # Reusing the abandoned id still gets its own answer
+                await write_stream.send(JSONRPCMessage(id="tools-list-1", method="tools/list"))
+                response = await read_stream.receive()
+                assert (response.id, response.result) == ("tools-list-1", {"method": "tools/list"})
+
+        tg.cancel_scope.cancel()
+
+
+@pytest.mark.asyncio
+async def test_daemon_stops_when_idle(tmp_path, monkeypatch):
+    monkeypatch.setattr(daemon, "DAEMON_DIR", tmp_path)
+    socket_path = tmp_path / "d.sock"
+    responses_send, responses_receive = anyio.create_memory_object_stream(10)
+    requests_send, requests_receive = anyio.create_memory_object_stream(0)
+
+    async def use_daemon():
+        while not await is_daemon_running(socket_path):
+            await anyio.sleep(0.01)
+        # Staying connected past the idle timeout keeps the daemon up
+        async with daemon_client(socket_path, 1):
+            await anyio.sleep(0.5)
+        assert socket_path.exists()
+
+    with anyio.fail_after(5):
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(_fake_server, "a", requests_receive, responses_send)
+            tg.start_soon(use_daemon)
+            await serve_daemon(socket_path, [(responses_receive, requests_send)], idle_timeout=0.3)
+            tg.cancel_scope.cancel()
+
+    assert not socket_path.exists()
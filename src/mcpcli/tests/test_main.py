@@ -0,0 +1,65 @@
+# tests/test_main.py
+from unittest.mock import patch
+
+import anyio
+import pytest
+
+from mcpcli import __main__ as cli
+
+
+def _fake_tools_list(delays, fail_index=None):
+    """Build a send_tools_list stand-in whose replies arrive after per-server delays."""
+    calls = []
+
+    async def send_tools_list(read_stream, write_stream):
+        index = read_stream
+        calls.append(index)
+        await anyio.sleep(delays[index])
+        if index == fail_index:
+            raise RuntimeError(f"server {index + 1} failed")
+        return {"tools": [{"name": f"tool-{index + 1}"}]}
+
+    return send_tools_list, calls
+
+
+def _render_recorder():
+    rendered = []
+
+    def record(panel):
+        rendered.append(panel.renderable.markup)
+
+    return rendered, record
+
+
+@pytest.mark.asyncio
+async def test_fanout_renders_in_server_order():
+    # Later servers reply first
+    send_tools_list, calls = _fake_tools_list([0.06, 0.03, 0])
+    rendered, record = _render_recorder()
+    server_streams = [(i, None) for i in range(3)]
+
+    with patch.object(cli, "send_tools_list", send_tools_list), patch.object(cli._CONSOLE, "print", record):
+        await cli._cmd_list_tools(server_streams)
+
+    assert sorted(calls) == [0, 1, 2]
+    assert [md.splitlines()[0] for md in rendered] == [
+        "## Server 1 Tools List",
+        "## Server 2 Tools List",
+        "## Server 3 Tools List",
+    ]
+    assert "tool-3" in rendered[2]
+
+
+@pytest.mark.asyncio
+async def test_fanout_raises_after_earlier_servers_render():
+    send_tools_list, calls = _fake_tools_list([0.03, 0.06, 0], fail_index=1)
+    rendered, record = _render_recorder()
+    server_streams = [(i, None) for i in range(3)]
+
+    with patch.object(cli, "send_tools_list", send_tools_list), patch.object(cli._CONSOLE, "print", record):
+        with pytest.raises(RuntimeError, match="server 2 failed"):
+            await cli._cmd_list_tools(server_streams)
+
+    # Every server still received the request, but only server 1 rendered
+    assert sorted(calls) == [0, 1, 2]
+    assert [md.splitlines()[0] for md in rendered] == ["## Server 1 Tools List"]
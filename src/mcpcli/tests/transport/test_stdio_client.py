@@ -0,0 +1,174 @@
+# tests/transport/test_stdio_client.py
+import math
+import sys
+
+import anyio
+import pytest
+
+from mcpcli.messages.message_types.json_rpc_message import JSONRPCMessage
+from mcpcli.transport.stdio import stdio_client as stdio_client_module
+from mcpcli.transport.stdio.stdio_client import stdio_client
+from mcpcli.transport.stdio.stdio_server_parameters import StdioServerParameters
+
+# Writes two JSON-RPC frames to stdout in awkward pieces: the first frame is
+# split mid-line and inside a multi-byte UTF-8 character, the second has no
+# trailing newline.
+CHUNKED_SERVER = r"""
+import sys, time
+frames = [
+    b'{"jsonrpc": "2.0", "id": "1", "result": {"text": "caf',
+    "é".encode()[:1],
+    "é".encode()[1:] + b'"}}\n\n{"jsonrpc": "2.0", ',
+    b'"id": "2", "result": {}}',
+]
+for frame in frames:
+    sys.stdout.buffer.write(frame)
+    sys.stdout.buffer.flush()
+    time.sleep(0.05)
+"""
+
+# Echoes every request back as a result containing the request method.
+ECHO_SERVER = r"""
+import json, sys
+for line in sys.stdin:
+    if line.strip():
+        msg = json.loads(line)
+        print(json.dumps({"jsonrpc": "2.0", "id": msg["id"], "result": {"method": msg["method"]}}), flush=True)
+"""
+
+# Replies with values Python's json.dumps writes by default but strict
+# parsers such as orjson reject: NaN, Infinity and a lone surrogate.
+NON_STRICT_JSON_SERVER = r"""
+import json, sys
+print(json.dumps({"jsonrpc": "2.0", "id": "1", "result": {"score": float("nan"), "max": float("inf"), "text": "\ud800"}}), flush=True)
+sys.stdin.read()
+"""
+
+# Echoes Content-Length framed requests back as framed responses, writing
+# each response one byte at a time so frames span many reads.
+LSP_ECHO_SERVER = r"""
+import json, sys, time
+stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+while True:
+    length = None
+    while (line := stdin.readline()) not in (b"\r\n", b""):
+        name, _, value = line.partition(b":")
+        if name.lower() == b"content-length":
+            length = int(value)
+    if length is None:
+        break
+    msg = json.loads(stdin.read(length))
+    body = json.dumps({"jsonrpc": "2.0", "id": msg["id"], "result": {"method": msg["method"]}}).encode()
+    for byte in b"Content-Length: %d\r\n\r\n" % len(body) + body:
+        stdout.write(bytes([byte]))
+        stdout.flush()
+"""
+
+BAD_HEADER_LSP_SERVER = r"""
+import sys
+stdout = sys.stdout.buffer
+body = b'{"jsonrpc": "2.0", "id": "1", "result": {}}'
+stdout.write(b"X-Bogus: 1\r\n\r\n")
+stdout.write(b"Content-Length: -5\r\n\r\n")
+stdout.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+stdout.flush()
+sys.stdin.read()
+"""
+
+def _params(script: str, **kwargs) -> StdioServerParameters:
+    return StdioServerParameters(command=sys.executable, args=["-c", script], **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_stdout_reader_reassembles_chunked_frames():
+    async with stdio_client(_params(CHUNKED_SERVER)) as (read_stream, write_stream):
+        await write_stream.aclose()
+        with anyio.fail_after(5):
+            messages = [message async for message in read_stream]
+
+    assert [m.id for m in messages] == ["1", "2"]
+    assert messages[0].result == {"text": "café"}
+    assert messages[1].result == {}
+
+
+@pytest.mark.asyncio
+async def test_stdout_reader_accepts_non_strict_json():
+    async with stdio_client(_params(NON_STRICT_JSON_SERVER)) as (read_stream, write_stream):
+        with anyio.fail_after(5):
+            message = await read_stream.receive()
+        await write_stream.aclose()
+
+    assert math.isnan(message.result["score"])
+    assert message.result["max"] == math.inf
+    assert message.result["text"] == "\ud800"
+
+
+@pytest.mark.asyncio
+async def test_stdin_writer_round_trip():
+    async with stdio_client(_params(ECHO_SERVER)) as (read_stream, write_stream):
+        with anyio.fail_after(5):
+            await write_stream.send(JSONRPCMessage(id="ping-1", method="ping"))
+            response = await read_stream.receive()
+        await write_stream.aclose()
+
+    assert response.id == "ping-1"
+    assert response.result == {"method": "ping"}
+
+
+@pytest.mark.asyncio
+async def test_stdin_writer_coalesces_queued_sends(monkeypatch):
+    writes = []
+    open_process = anyio.open_process
+
+    async def spying_open_process(*args, **kwargs):
+        process = await open_process(*args, **kwargs)
+        send = process.stdin.send
+
+        async def recording_send(data: bytes):
+            writes.append(data)
+            await send(data)
+
+        monkeypatch.setattr(process.stdin, "send", recording_send)
+        return process
+
+    monkeypatch.setattr(stdio_client_module.anyio, "open_process", spying_open_process)
+
+    async with stdio_client(_params(ECHO_SERVER)) as (read_stream, write_stream):
+        with anyio.fail_after(5):
+            async with anyio.create_task_group() as tg:
+                for i in range(5):
+                    tg.start_soon(write_stream.send, JSONRPCMessage(id=str(i), method=f"m{i}"))
+            responses = [await read_stream.receive() for _ in range(5)]
+        await write_stream.aclose()
+
+    assert sorted(r.id for r in responses) == ["0", "1", "2", "3", "4"]
+    assert all(r.result == {"method": f"m{r.id}"} for r in responses)
+    # Messages queued while the writer was busy go out in a single write
+    assert len(writes) == 1
+    assert writes[0].count(b"\n") == 5
+
+
+@pytest.mark.asyncio
+async def test_lsp_framing_round_trip():
+    params = _params(LSP_ECHO_SERVER, framing="lsp")
+    async with stdio_client(params) as (read_stream, write_stream):
+        with anyio.fail_after(5):
+            await write_stream.send(JSONRPCMessage(id="1", method="initialize"))
+            first = await read_stream.receive()
+            await write_stream.send(JSONRPCMessage(id="2", method="tools/list"))
+            second = await read_stream.receive()
+        await write_stream.aclose()
+
+    assert (first.id, first.result) == ("1", {"method": "initialize"})
+    assert (second.id, second.result) == ("2", {"method": "tools/list"})
+
+
+@pytest.mark.asyncio
+async def test_lsp_framing_skips_malformed_headers():
+    params = _params(BAD_HEADER_LSP_SERVER, framing="lsp")
+    async with stdio_client(params) as (read_stream, write_stream):
+        with anyio.fail_after(5):
+            message = await read_stream.receive()
+        await write_stream.aclose()
+
+    assert (message.id, message.result) == ("1", {})
@@ -6,12 +6,53 @@ import traceback
 from contextlib import asynccontextmanager
 
 import anyio
-from anyio.streams.text import TextReceiveStream
+from pydantic import TypeAdapter
 
 from mcpcli.environment import get_default_environment
 from mcpcli.messages.message_types.json_rpc_message import JSONRPCMessage
 from mcpcli.transport.stdio.stdio_server_parameters import StdioServerParameters
 
+# 模組專用 logger;熱路徑上的 debug 訊息先以 isEnabledFor 檢查(Logger 會快取結果)再格式化
+_log = logging.getLogger(__name__)
+
+# 優先使用 orjson 解析 JSON-RPC 訊息,未安裝時退回標準庫 json(pip install "mcp-cli[fast]")。
+# 注意:orjson 會把超過 64 位元的整數解析成 float 而失去精度,標準庫則保留精確整數
+try:
+    import orjson
+
+    def parse_json(data: bytes):
+        """解析一則 JSON 訊息;orjson 無法解析時改用標準庫."""
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson 拒絕 NaN、Infinity 與單獨的代理字元跳脫(如 "\ud800"),
+            # 但 Python 的 json.dumps 預設會輸出這些內容;只在失敗時以標準庫重試
+            return json.loads(data)
+except ImportError:
+    parse_json = json.loads
+
+
+# 讀取流的緩衝大小:讓 stdout_reader 能在消費者處理前一則訊息時繼續解析後續訊息
+READ_STREAM_BUFFER_SIZE = 64
+
+# 預設繼承的環境變數在匯入時取得一次,供每個子進程共用
+_DEFAULT_ENV = get_default_environment()
+
+# 在模組層級建立一次 JSON-RPC 訊息驗證器,供每個讀入的訊息重複使用(daemon 也共用)
+JSONRPC_ADAPTER = TypeAdapter(JSONRPCMessage)
+
+
+def _parse_content_length(header: bytes) -> int:
+    """從 LSP 風格的訊息標頭中取出 Content-Length."""
+    for field in header.split(b"\r\n"):
+        name, _, value = field.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+            if length < 0:
+                raise ValueError(f"Invalid Content-Length header: {header!r}")
+            return length
+    raise ValueError(f"Missing Content-Length header: {header!r}")
+
 
 @asynccontextmanager
 async def stdio_client(server: StdioServerParameters):
@@ -23,110 +64,176 @@ async def stdio_client(server: StdioServerParameters):
     if not isinstance(server.args, (list, tuple)):
         raise ValueError("Server arguments must be a list or tuple.")
 
-    # 建立讀取和寫入流
-    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
+    # 建立讀取和寫入流(寫入流維持無緩衝,保留對子進程的背壓)
+    read_stream_writer, read_stream = anyio.create_memory_object_stream(
+        READ_STREAM_BUFFER_SIZE
+    )
     write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
 
-    # 啟動子進程
+    # 啟動子進程(沒有額外環境變數時直接使用預設環境,省去合併字典)
+    env = {**_DEFAULT_ENV, **server.env} if server.env else _DEFAULT_ENV
     process = await anyio.open_process(
         [server.command, *server.args],
-        env={**get_default_environment(), **(server.env or {})},
+        env=env,
         stderr=sys.stderr,
     )
 
     # 服務器已啟動
-    logging.debug(
+    _log.debug(
         f"Subprocess started with PID {process.pid}, command: {server.command}"
     )
 
     # 創建一個任務從子進程的 stdout 讀取
-    async def process_json_line(line: str, writer):
+    async def process_json_line(line: bytes, writer):
+        # f-string 會立即求值,因此僅在 debug 模式下才格式化除錯訊息
+        debug = _log.isEnabledFor(logging.DEBUG)
         try:
-            logging.debug(f"Processing line: {line.strip()}")
-            data = json.loads(line)
+            if debug:
+                _log.debug(f"Processing line: {line.strip().decode(errors='replace')}")
+            data = parse_json(line)
 
             # 解析 JSON
-            logging.debug(f"Parsed JSON data: {data}")
+            if debug:
+                _log.debug(f"Parsed JSON data: {data}")
 
             # 驗證 JSON-RPC 消息
-            message = JSONRPCMessage.model_validate(data)
-            logging.debug(f"Validated JSONRPCMessage: {message}")
+            message = JSONRPC_ADAPTER.validate_python(data)
+            if debug:
+                _log.debug(f"Validated JSONRPCMessage: {message}")
 
             # 發送消息
             await writer.send(message)
         except json.JSONDecodeError as exc:
             # 不是有效的 JSON
-            logging.error(f"JSON decode error: {exc}. Line: {line.strip()}")
+            _log.error(
+                f"JSON decode error: {exc}. Line: {line.strip().decode(errors='replace')}"
+            )
         except Exception as exc:
             # 其他異常
-            logging.error(f"Error processing message: {exc}. Line: {line.strip()}")
-            logging.debug(f"Traceback:\n{traceback.format_exc()}")
+            _log.error(
+                f"Error processing message: {exc}. Line: {line.strip().decode(errors='replace')}"
+            )
+            _log.debug(f"Traceback:\n{traceback.format_exc()}")
+
+    async def read_newline_frames():
+        """讀取以換行分隔的 JSON-RPC 消息."""
+        buffer = bytearray()
+        # 直接讀取原始位元組,交由 JSON 解析器處理,省去 UTF-8 解碼
+        async for chunk in process.stdout:
+            # 就地擴充緩衝區,只在收到完整行時才切出並截斷,避免每個 chunk 都複製未完成的尾段
+            buffer.extend(chunk)
+            end = buffer.rfind(b"\n")
+            if end < 0:
+                continue
+            lines = buffer[:end].split(b"\n")
+            del buffer[: end + 1]
+            for line in lines:
+                if line.strip():
+                    await process_json_line(line, read_stream_writer)
+        if buffer.strip():
+            await process_json_line(buffer, read_stream_writer)
+
+    async def read_lsp_frames():
+        """讀取以 Content-Length 標頭分框的 JSON-RPC 消息,只掃描標頭,訊息本體依長度直接切出."""
+        buffer = bytearray()
+        body_length = None
+        async for chunk in process.stdout:
+            buffer.extend(chunk)
+            while True:
+                if body_length is None:
+                    header_end = buffer.find(b"\r\n\r\n")
+                    if header_end < 0:
+                        break
+                    try:
+                        body_length = _parse_content_length(bytes(buffer[:header_end]))
+                    except ValueError as exc:
+                        # 丟棄無效的標頭並從下一個標頭重新同步,不讓單一壞訊息中斷整個連線
+                        _log.error(f"Dropping malformed LSP header: {exc}")
+                        del buffer[: header_end + 4]
+                        continue
+                    del buffer[: header_end + 4]
+                if len(buffer) < body_length:
+                    break
+                body = bytes(buffer[:body_length])
+                del buffer[:body_length]
+                body_length = None
+                await process_json_line(body, read_stream_writer)
 
     async def stdout_reader():
         """從服務器的 stdout 讀取 JSON-RPC 消息."""
         # 確保進程的 stdout 存在
         assert process.stdout, "Opened process is missing stdout"
-        buffer = ""
-        logging.debug("Starting stdout_reader")
+        _log.debug("Starting stdout_reader")
         try:
             async with read_stream_writer:
-                async for chunk in TextReceiveStream(process.stdout):
-                    lines = (buffer + chunk).split("\n")
-                    buffer = lines.pop()
-                    for line in lines:
-                        if line.strip():
-                            await process_json_line(line, read_stream_writer)
-                if buffer.strip():
-                    await process_json_line(buffer, read_stream_writer)
+                if server.framing == "lsp":
+                    await read_lsp_frames()
+                else:
+                    await read_newline_frames()
         except anyio.ClosedResourceError:
-            logging.debug("Read stream closed.")
+            _log.debug("Read stream closed.")
         except Exception as exc:
-            logging.error(f"Unexpected error in stdout_reader: {exc}")
-            logging.debug(f"Traceback:\n{traceback.format_exc()}")
+            _log.error(f"Unexpected error in stdout_reader: {exc}")
+            _log.debug(f"Traceback:\n{traceback.format_exc()}")
             raise
         finally:
-            logging.debug("Exiting stdout_reader")
+            _log.debug("Exiting stdout_reader")
 
     async def stdin_writer():
         """從寫入流發送 JSON-RPC 消息到服務器的 stdin."""
         # 確保進程的 stdin 存在
         assert process.stdin, "Opened process is missing stdin"
-        logging.debug("Starting stdin_writer")
+        _log.debug("Starting stdin_writer")
+
+        def encode_message(message) -> bytes:
+            # 直接由 pydantic-core 序列化為 bytes,不經過中間 dict 也不需再 encode
+            payload = message.__pydantic_serializer__.to_json(message, exclude_none=True)
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug(f"Sending: {payload.decode()}")
+            if server.framing == "lsp":
+                return b"Content-Length: %d\r\n\r\n" % len(payload) + payload
+            return payload + b"\n"
+
         try:
             async with write_stream_reader:
                 async for message in write_stream_reader:
-                    json_str = message.model_dump_json(exclude_none=True)
-                    logging.debug(f"Sending: {json_str}")
-                    await process.stdin.send((json_str + "\n").encode())
+                    frames = [encode_message(message)]
+                    # 將已在等待的訊息一併取出,合併為單次寫入
+                    while True:
+                        try:
+                            frames.append(encode_message(write_stream_reader.receive_nowait()))
+                        except (anyio.WouldBlock, anyio.EndOfStream):
+                            break
+                    await process.stdin.send(b"".join(frames))
         except anyio.ClosedResourceError:
-            logging.debug("Write stream closed.")
+            _log.debug("Write stream closed.")
         except Exception as exc:
-            logging.error(f"Unexpected error in stdin_writer: {exc}")
-            logging.debug(f"Traceback:\n{traceback.format_exc()}")
+            _log.error(f"Unexpected error in stdin_writer: {exc}")
+            _log.debug(f"Traceback:\n{traceback.format_exc()}")
             raise
         finally:
-            logging.debug("Exiting stdin_writer")
+            _log.debug("Exiting stdin_writer")
 
     async def terminate_process():
         """優雅地終止子進程."""
         try:
             if process.returncode is None:  # 進程仍在運行
-                logging.debug("Terminating subprocess...")
+                _log.debug("Terminating subprocess...")
                 process.terminate()
                 with anyio.fail_after(5):
                     await process.wait()
             else:
-                logging.info("Process already terminated.")
+                _log.info("Process already terminated.")
         except TimeoutError:
-            logging.warning(
+            _log.warning(
                 "Process did not terminate gracefully. Forcefully killing it."
             )
             try:
                 process.kill()
             except Exception as kill_exc:
-                logging.error(f"Error killing process: {kill_exc}")
+                _log.error(f"Error killing process: {kill_exc}")
         except Exception as exc:
-            logging.error(f"Error during process termination: {exc}")
+            _log.error(f"Error during process termination: {exc}")
 
     try:
         async with anyio.create_task_group() as tg, process:
@@ -136,13 +243,13 @@ async def stdio_client(server: StdioServerParameters):
 
         # 退出任務組
         exit_code = await process.wait()
-        logging.info(f"Process exited with code {exit_code}")
+        _log.info(f"Process exited with code {exit_code}")
     except Exception as exc:
         # 其他異常
-        logging.error(f"Unhandled error in TaskGroup: {exc}")
-        logging.debug(f"Traceback:\n{traceback.format_exc()}")
+        _log.error(f"Unhandled error in TaskGroup: {exc}")
+        _log.debug(f"Traceback:\n{traceback.format_exc()}")
         if hasattr(exc, "__cause__") and exc.__cause__:
-            logging.debug(f"TaskGroup exception cause: {exc.__cause__}")
+            _log.debug(f"TaskGroup exception cause: {exc.__cause__}")
         raise
     finally:
         await terminate_process()
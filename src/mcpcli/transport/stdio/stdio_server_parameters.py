@@ -1,8 +1,10 @@
 # transport/stdio/stdio_server_parameters.py
 from pydantic import BaseModel, Field
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Literal, Optional
 
 class StdioServerParameters(BaseModel):
     command: str
     args: list[str] = Field(default_factory=list)
-    env: Optional[Dict[str, str]] = None
\ No newline at end of file
+    env: Optional[Dict[str, str]] = None
+    # "newline": one JSON message per line; "lsp": Content-Length framed messages
+    framing: Literal["newline", "lsp"] = "newline"
\ No newline at end of file